@@ -0,0 +1,198 @@
+"""Índice em memória da ocupação dos horários (slots) por médico e por dia.
+
+Cada dia é dividido em janelas de SLOT_MINUTES minutos. Para cada médico e mês
+guardamos dois arrays contíguos de contadores por janela (`slots` e `booked`),
+de forma que as consultas mensais viram somas sobre poucos kilobytes, sem
+carregar objetos do ORM nem schemas do Pydantic. Vários slots na mesma janela
+(ou fora do alinhamento de 15 minutos) são contados separadamente.
+
+A consistência com o banco é dada pela linha única `slots_version`, que
+`crud` e `seed` incrementam na mesma transação em que alteram slots.
+"""
+import calendar
+import threading
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from . import models
+
+SLOT_MINUTES = 15
+WINDOWS_PER_DAY = 24 * 60 // SLOT_MINUTES
+INDEX_TTL_SECONDS = 300
+SLOTS_VERSION_ID = 1
+
+
+def _monotonic() -> float:
+    return time.monotonic()
+
+
+def _window(start_time: datetime) -> int:
+    return (start_time.hour * 60 + start_time.minute) // SLOT_MINUTES
+
+
+def current_slots_version(db: Session) -> int:
+    return db.query(models.SlotsVersion.version)\
+             .filter(models.SlotsVersion.id == SLOTS_VERSION_ID)\
+             .scalar() or 0
+
+
+def bump_slots_version(db: Session) -> int:
+    """Incrementa a versão dos slots na transação corrente (sem commit) e retorna o novo valor."""
+    updated = db.query(models.SlotsVersion)\
+                .filter(models.SlotsVersion.id == SLOTS_VERSION_ID)\
+                .update({models.SlotsVersion.version: models.SlotsVersion.version + 1}, synchronize_session=False)
+    if not updated:
+        # Começa de um valor do relógio para não repetir versões quando o `seed` recria as tabelas.
+        db.add(models.SlotsVersion(id=SLOTS_VERSION_ID, version=time.time_ns()))
+        db.flush()
+    return current_slots_version(db)
+
+
+class MonthCounters:
+    """Contadores por janela de um médico em um mês: slots existentes e slots agendados."""
+
+    def __init__(self, year: int, month: int):
+        self.days_in_month = calendar.monthrange(year, month)[1]
+        size = self.days_in_month * WINDOWS_PER_DAY
+        self.slots = array("H", [0]) * size
+        self.booked = array("H", [0]) * size
+
+    @staticmethod
+    def _position(start_time: datetime) -> int:
+        return (start_time.day - 1) * WINDOWS_PER_DAY + _window(start_time)
+
+    def add(self, start_time: datetime, is_booked: bool):
+        position = self._position(start_time)
+        self.slots[position] += 1
+        if is_booked:
+            self.booked[position] += 1
+
+    def set_booked(self, start_time: datetime, is_booked: bool):
+        self.booked[self._position(start_time)] += 1 if is_booked else -1
+
+    def day_counts(self, day: int, from_window: int = 0) -> tuple:
+        """Retorna (total, agendados) do dia a partir da janela `from_window`."""
+        start = (day - 1) * WINDOWS_PER_DAY
+        end = start + WINDOWS_PER_DAY
+        start += from_window
+        return sum(self.slots[start:end]), sum(self.booked[start:end])
+
+
+def _month(months: dict, doctor_id: int, start_time: datetime) -> MonthCounters:
+    key = (doctor_id, start_time.year, start_time.month)
+    counters = months.get(key)
+    if counters is None:
+        counters = months[key] = MonthCounters(start_time.year, start_time.month)
+    return counters
+
+
+class AvailabilityIndex:
+    """Índice de disponibilidade construído a partir da tabela de slots.
+
+    Cada consulta lê `slots_version` pela chave primária e reconstrói o índice
+    quando a versão difere da carregada. Agendamentos e cancelamentos feitos
+    neste processo aplicam o delta diretamente se o índice estava na versão
+    imediatamente anterior. Escritas que não passam por `bump_slots_version`
+    só são vistas após INDEX_TTL_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._months = {}
+        self._version = None
+        self._built_at = None
+
+    def reset(self):
+        with self._lock:
+            self._months = {}
+            self._version = None
+            self._built_at = None
+
+    def ensure_built(self, db: Session):
+        version = current_slots_version(db)
+        with self._lock:
+            if version == self._version and _monotonic() - self._built_at <= INDEX_TTL_SECONDS:
+                return
+
+        months = {}
+        rows = db.query(models.Slot.doctor_id, models.Slot.start_time, models.Slot.is_booked)\
+                 .filter(models.Slot.start_time.isnot(None))
+        for doctor_id, start_time, is_booked in rows:
+            _month(months, doctor_id, start_time).add(start_time, bool(is_booked))
+
+        with self._lock:
+            self._months = months
+            self._version = version
+            self._built_at = _monotonic()
+
+    def mark_booked(self, doctor_id: int, start_time: datetime, version: int):
+        self._set_booked(doctor_id, start_time, True, version)
+
+    def mark_free(self, doctor_id: int, start_time: datetime, version: int):
+        self._set_booked(doctor_id, start_time, False, version)
+
+    def _set_booked(self, doctor_id: int, start_time: datetime, is_booked: bool, version: int):
+        # Fora de sequência (outra escrita no meio ou índice ainda não carregado) a próxima consulta reconstrói.
+        with self._lock:
+            if self._version is None or self._version != version - 1:
+                return
+            counters = self._months.get((doctor_id, start_time.year, start_time.month))
+            if counters is None:
+                self._version = None
+                return
+            counters.set_booked(start_time, is_booked)
+            self._version = version
+
+    def available_per_day(self, db: Session, doctor_id: int, year: int, month: int, now: datetime) -> dict:
+        """Retorna {dia: quantidade de slots livres} considerando apenas horários futuros."""
+        if (year, month) < (now.year, now.month):
+            return {}
+        is_current_month = (year, month) == (now.year, now.month)
+
+        if is_current_month:
+            # A janela atual pode estar parcialmente no passado: é resolvida direto no banco.
+            current_window = _window(now)
+            window_end = now.replace(hour=0, minute=0, second=0, microsecond=0)\
+                + timedelta(minutes=(current_window + 1) * SLOT_MINUTES)
+            current_window_available = db.query(func.count(models.Slot.id))\
+                                         .filter(models.Slot.doctor_id == doctor_id)\
+                                         .filter(models.Slot.is_booked == False)\
+                                         .filter(models.Slot.start_time > now)\
+                                         .filter(models.Slot.start_time < window_end)\
+                                         .scalar()
+
+        result = {}
+        with self._lock:
+            counters = self._months.get((doctor_id, year, month))
+            if counters is None:
+                return {}
+            for day in range(now.day if is_current_month else 1, counters.days_in_month + 1):
+                if is_current_month and day == now.day:
+                    total, booked = counters.day_counts(day, from_window=current_window + 1)
+                    available = total - booked + current_window_available
+                else:
+                    total, booked = counters.day_counts(day)
+                    available = total - booked
+                if available:
+                    result[date(year, month, day)] = available
+        return result
+
+    def occupancy_per_day(self, year: int, month: int) -> list:
+        """Retorna [(dia, total de slots, slots agendados)] somando todos os médicos."""
+        days_in_month = calendar.monthrange(year, month)[1]
+        totals = [0] * days_in_month
+        booked = [0] * days_in_month
+        with self._lock:
+            for (_, y, m), counters in self._months.items():
+                if (y, m) != (year, month):
+                    continue
+                for day in range(days_in_month):
+                    day_total, day_booked = counters.day_counts(day + 1)
+                    totals[day] += day_total
+                    booked[day] += day_booked
+        return [(date(year, month, day + 1), totals[day], booked[day]) for day in range(days_in_month)]
+
+
+availability_index = AvailabilityIndex()
@@ -3,6 +3,7 @@ from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 import json
 from . import models, schemas
+from .availability import availability_index, bump_slots_version
 from .database import redis_client
 
 CACHE_KEY_AVAILABLE_SLOTS = "available_slots"
@@ -104,6 +105,32 @@ def get_available_slots(db: Session, skip: int = 0, limit: int = 100):
 
     return pydantic_dicts
 
+def get_doctor(db: Session, doctor_id: int):
+    return db.query(models.Doctor).filter(models.Doctor.id == doctor_id).first()
+
+def get_doctor_calendar(db: Session, doctor_id: int, year: int, month: int):
+    availability_index.ensure_built(db)
+    available = availability_index.available_per_day(db, doctor_id, year, month, now=datetime.utcnow())
+    return schemas.CalendarSummary(
+        doctor_id=doctor_id,
+        year=year,
+        month=month,
+        days=[schemas.CalendarDay(day=day, available_slots=count) for day, count in sorted(available.items())]
+    )
+
+def get_monthly_occupancy(db: Session, year: int, month: int):
+    availability_index.ensure_built(db)
+    days = [
+        schemas.OccupancyDay(
+            day=day,
+            total_slots=total,
+            booked_slots=booked,
+            occupancy_rate=round(booked / total, 4) if total else 0.0
+        )
+        for day, total, booked in availability_index.occupancy_per_day(year, month)
+    ]
+    return schemas.OccupancyReport(year=year, month=month, days=days)
+
 def get_appointment(db: Session, appointment_id: int):
     db_appointment = db.query(models.Appointment)\
         .options(
@@ -141,13 +168,16 @@ def create_appointment(db: Session, appointment: schemas.AppointmentCreate) -> i
 
     try:
         db.add(db_appointment)
+        slots_version = bump_slots_version(db)
         db.commit()
         db.refresh(db_appointment)
         _invalidate_slots_cache()
-        return db_appointment.id
     except Exception as e:
         db.rollback()
         raise e
+
+    availability_index.mark_booked(db_slot.doctor_id, db_slot.start_time, slots_version)
+    return db_appointment.id
     
 def cancel_appointment(db: Session, appointment_id: int) -> int: # Alterado: Retorna int
     
@@ -162,12 +192,15 @@ def cancel_appointment(db: Session, appointment_id: int) -> int: # Alterado: Ret
     db_appointment.status = models.AppointmentStatus.CANCELLED
 
     try:
+        slots_version = bump_slots_version(db)
         db.commit()
         _invalidate_slots_cache()
-        return db_appointment.id
     except Exception as e:
         db.rollback()
         raise e
+
+    availability_index.mark_free(db_appointment.slot.doctor_id, db_appointment.slot.start_time, slots_version)
+    return db_appointment.id
     
 def get_patient_active_appointments(db: Session, email: str):
     db_patient = get_patient_by_email(db, email=email)
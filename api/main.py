@@ -1,6 +1,7 @@
 from fastapi import FastAPI, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from . import crud, models, schemas
 from .database import get_db, create_db_and_tables
 from pydantic import EmailStr
@@ -24,6 +25,16 @@ def get_available_slots(db: Session = Depends(get_db)):
         slots = crud.get_available_slots(db)
         return slots
 
+@app.get("/medicos/{doctor_id}/calendario", response_model=schemas.CalendarSummary, tags=["Agendamentos"])
+def get_doctor_calendar(doctor_id: int,
+                        ano: Optional[int] = Query(None, ge=1, le=9999, description="Ano do calendário (padrão: ano atual)."),
+                        mes: Optional[int] = Query(None, ge=1, le=12, description="Mês do calendário (padrão: mês atual)."),
+                        db: Session = Depends(get_db)):
+        if not crud.get_doctor(db, doctor_id=doctor_id):
+                raise HTTPException(status_code=404, detail="Médico não encontrado.")
+        now = datetime.utcnow()
+        return crud.get_doctor_calendar(db, doctor_id=doctor_id, year=ano or now.year, month=mes or now.month)
+
 @app.post("/agendar", response_model=schemas.Appointment, status_code=201, tags=["Agendamentos"])
 def create_appointment(appointment: schemas.AppointmentCreate, db: Session = Depends(get_db)):
     try:
@@ -58,6 +69,13 @@ def get_payment_info():
                 pix_key="doutor@agendamento.com"
         )
 
+@app.get("/ocupacao", response_model=schemas.OccupancyReport, tags=["Informações"])
+def get_monthly_occupancy(ano: Optional[int] = Query(None, ge=1, le=9999, description="Ano do relatório (padrão: ano atual)."),
+                          mes: Optional[int] = Query(None, ge=1, le=12, description="Mês do relatório (padrão: mês atual)."),
+                          db: Session = Depends(get_db)):
+        now = datetime.utcnow()
+        return crud.get_monthly_occupancy(db, year=ano or now.year, month=mes or now.month)
+
 @app.post("/pacientes/", response_model=schemas.Patient, status_code=201, tags=["Pacientes"])
 def create_or_get_patient(patient: schemas.PatientCreate, db: Session = Depends(get_db)):
         db_patient = crud.get_patient_by_email(db, email=patient.email)
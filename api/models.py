@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import create_engine, Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
@@ -54,4 +54,11 @@ class Appointment(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     status = Column(Enum(AppointmentStatus), default=AppointmentStatus.PENDING)
     slot = relationship("Slot", back_populates="appointment")
-    patient = relationship("Patient", back_populates="appointments")
\ No newline at end of file
+    patient = relationship("Patient", back_populates="appointments")
+
+class SlotsVersion(Base):
+    """Marcador de versão da tabela de slots, incrementado a cada escrita."""
+    __tablename__ = "slots_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
-from datetime import datetime
+from datetime import date, datetime
 from .models import AppointmentStatus
 from typing import List, Optional
 
@@ -52,3 +52,24 @@ class PaymentInfo(BaseModel):
     methods: List[str]
     value: str
     pix_key: Optional[str] = None
+
+class CalendarDay(BaseModel):
+    day: date
+    available_slots: int
+
+class CalendarSummary(BaseModel):
+    doctor_id: int
+    year: int
+    month: int
+    days: List[CalendarDay]
+
+class OccupancyDay(BaseModel):
+    day: date
+    total_slots: int
+    booked_slots: int
+    occupancy_rate: float
+
+class OccupancyReport(BaseModel):
+    year: int
+    month: int
+    days: List[OccupancyDay]
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 import random
 from .database import SessionLocal, create_db_and_tables, engine
 from .models import Base, Doctor, Patient, Slot, Appointment, AppointmentStatus
+from .availability import bump_slots_version
 from sqlalchemy.orm import Session
 
 def create_fake_appointment(db: Session, doctor: Doctor, patient: Patient, start_time: datetime, status: AppointmentStatus, created_days_ago: int):
@@ -79,6 +80,7 @@ def seed_database():
                     ))
         
         db.add_all(available_slots)
+        bump_slots_version(db)
         
         db.commit()
         
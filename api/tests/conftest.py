@@ -0,0 +1,47 @@
+import pytest
+from datetime import datetime, timedelta
+from .test_database import TestingSessionLocal, engine
+from api.availability import availability_index
+from api.models import Base, Doctor, Slot, Patient
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    availability_index.reset()
+    
+    db = TestingSessionLocal()
+    
+    try:
+        dr_test = Doctor(name="Dr. Teste", specialty="Testologia")
+        pac_test = Patient(name="Paciente Teste", email="teste@teste.com")
+        db.add_all([dr_test, pac_test])
+        db.commit()
+
+        slot_disponivel = Slot(
+            doctor_id=dr_test.id,
+            start_time=datetime.utcnow() + timedelta(days=1, hours=1),
+            end_time=datetime.utcnow() + timedelta(days=1, hours=2),
+            is_booked=False
+        )
+        slot_ocupado = Slot(
+            doctor_id=dr_test.id,
+            start_time=datetime.utcnow() + timedelta(days=1, hours=2),
+            end_time=datetime.utcnow() + timedelta(days=1, hours=3),
+            is_booked=True
+        )
+        slot_passado = Slot(
+            doctor_id=dr_test.id,
+            start_time=datetime.utcnow() - timedelta(days=1),
+            end_time=datetime.utcnow() - timedelta(days=1, hours=1),
+            is_booked=False
+        )
+        
+        db.add_all([slot_disponivel, slot_ocupado, slot_passado])
+        db.commit()
+        
+        yield db
+    
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
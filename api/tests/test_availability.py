@@ -0,0 +1,114 @@
+from datetime import date, datetime
+from unittest.mock import patch
+from sqlalchemy.orm import Session
+from api import crud, schemas
+from api.availability import AvailabilityIndex, INDEX_TTL_SECONDS, availability_index, bump_slots_version
+from api.models import Doctor, Patient, Slot
+
+DIA = datetime(2100, 1, 10)
+ANTES = datetime(2100, 1, 1)
+
+
+def add_slot(db: Session, hour: int, minute: int = 0, day: datetime = DIA) -> Slot:
+    doctor = db.query(Doctor).first()
+    slot = Slot(
+        doctor_id=doctor.id,
+        start_time=day.replace(hour=hour, minute=minute),
+        end_time=day.replace(hour=hour + 1, minute=minute),
+        is_booked=False
+    )
+    db.add(slot)
+    bump_slots_version(db)
+    db.commit()
+    return slot
+
+def agendar(db: Session, slot: Slot) -> int:
+    paciente = db.query(Patient).first()
+    return crud.create_appointment(db, schemas.AppointmentCreate(slot_id=slot.id, patient_id=paciente.id))
+
+def test_slots_in_same_window_are_counted_separately(db_session: Session):
+    slot_10h = add_slot(db_session, 10, 0)
+    slot_10h10 = add_slot(db_session, 10, 10)
+    doctor_id = slot_10h.doctor_id
+    availability_index.ensure_built(db_session)
+
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {DIA.date(): 2}
+
+    appointment_id = agendar(db_session, slot_10h10)
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {DIA.date(): 1}
+    assert availability_index.occupancy_per_day(2100, 1)[DIA.day - 1] == (DIA.date(), 2, 1)
+
+    agendar(db_session, slot_10h)
+    crud.cancel_appointment(db_session, appointment_id)
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {DIA.date(): 1}
+
+    # Os deltas aplicados devem coincidir com uma reconstrução completa.
+    reconstruido = AvailabilityIndex()
+    reconstruido.ensure_built(db_session)
+    assert reconstruido.occupancy_per_day(2100, 1) == availability_index.occupancy_per_day(2100, 1)
+
+def test_index_sees_bookings_from_other_workers(db_session: Session):
+    slot_a = add_slot(db_session, 10, day=DIA)
+    slot_b = add_slot(db_session, 10, day=DIA.replace(day=11))
+    doctor_id = slot_a.doctor_id
+    appointment_b = agendar(db_session, slot_b)
+    outro_worker = AvailabilityIndex()
+    outro_worker.ensure_built(db_session)
+    assert outro_worker.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {DIA.date(): 1}
+
+    # Agendar um slot e cancelar outro mantém contagens iguais, mas muda a versão.
+    agendar(db_session, slot_a)
+    crud.cancel_appointment(db_session, appointment_b)
+    outro_worker.ensure_built(db_session)
+    assert outro_worker.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {date(2100, 1, 11): 1}
+
+def test_out_of_sequence_update_is_ignored(db_session: Session):
+    slot = add_slot(db_session, 10)
+    index = AvailabilityIndex()
+    index.ensure_built(db_session)
+
+    index.mark_booked(slot.doctor_id, slot.start_time, version=0)
+
+    assert index.occupancy_per_day(2100, 1)[DIA.day - 1] == (DIA.date(), 1, 0)
+
+def test_current_window_keeps_future_slots(db_session: Session):
+    slot_passado = add_slot(db_session, 10, 0)
+    add_slot(db_session, 10, 10)
+    doctor_id = slot_passado.doctor_id
+    availability_index.ensure_built(db_session)
+
+    now = DIA.replace(hour=10, minute=5)
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, now) == {DIA.date(): 1}
+
+    now = DIA.replace(hour=10, minute=10)
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, now) == {}
+
+def test_index_rebuilds_when_slots_version_changes(db_session: Session):
+    slot = add_slot(db_session, 10)
+    slot_id, doctor_id = slot.id, slot.doctor_id
+    availability_index.ensure_built(db_session)
+
+    add_slot(db_session, 11)
+    availability_index.ensure_built(db_session)
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {DIA.date(): 2}
+
+    db_session.query(Slot).filter(Slot.id == slot_id).update({"start_time": datetime(2100, 1, 20, 10)})
+    bump_slots_version(db_session)
+    db_session.commit()
+    availability_index.ensure_built(db_session)
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {DIA.date(): 1, date(2100, 1, 20): 1}
+
+def test_index_rebuilds_after_ttl(db_session: Session):
+    slot = add_slot(db_session, 10)
+    slot_id, doctor_id = slot.id, slot.doctor_id
+    availability_index.ensure_built(db_session)
+
+    # Escrita que não incrementa a versão: só o TTL a detecta.
+    db_session.query(Slot).filter(Slot.id == slot_id).delete()
+    db_session.commit()
+    availability_index.ensure_built(db_session)
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {DIA.date(): 1}
+
+    with patch("api.availability._monotonic", return_value=availability_index._built_at + INDEX_TTL_SECONDS + 1):
+        availability_index.ensure_built(db_session)
+    assert availability_index.available_per_day(db_session, doctor_id, 2100, 1, ANTES) == {}
@@ -2,52 +2,12 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from .test_database import TestingSessionLocal, engine, override_get_db
 from api.main import app, get_db
 from api.models import Base, Doctor, Slot, Patient, AppointmentStatus
 from api.seed import seed_database 
+from api.availability import bump_slots_version
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    Base.metadata.create_all(bind=engine)
-    
-    db = TestingSessionLocal()
-    
-    try:
-        dr_test = Doctor(name="Dr. Teste", specialty="Testologia")
-        pac_test = Patient(name="Paciente Teste", email="teste@teste.com")
-        db.add_all([dr_test, pac_test])
-        db.commit()
-
-        slot_disponivel = Slot(
-            doctor_id=dr_test.id,
-            start_time=datetime.utcnow() + timedelta(days=1, hours=1),
-            end_time=datetime.utcnow() + timedelta(days=1, hours=2),
-            is_booked=False
-        )
-        slot_ocupado = Slot(
-            doctor_id=dr_test.id,
-            start_time=datetime.utcnow() + timedelta(days=1, hours=2),
-            end_time=datetime.utcnow() + timedelta(days=1, hours=3),
-            is_booked=True
-        )
-        slot_passado = Slot(
-            doctor_id=dr_test.id,
-            start_time=datetime.utcnow() - timedelta(days=1),
-            end_time=datetime.utcnow() - timedelta(days=1, hours=1),
-            is_booked=False
-        )
-        
-        db.add_all([slot_disponivel, slot_ocupado, slot_passado])
-        db.commit()
-        
-        yield db
-    
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
-
 @pytest.fixture(scope="function")
 def client(db_session):
     app.dependency_overrides[get_db] = lambda: db_session
@@ -131,4 +91,96 @@ def test_cancel_appointment(client, db_session: Session):
     assert response_cancela.json()["status"] == AppointmentStatus.CANCELLED.value
     
     slot_no_db = db_session.get(Slot, slot.id)
-    assert slot_no_db.is_booked == False
\ No newline at end of file
+    assert slot_no_db.is_booked == False
+
+def test_get_doctor_calendar(client, db_session: Session):
+    slot = db_session.query(Slot).filter(Slot.is_booked == False, Slot.start_time > datetime.utcnow()).first()
+    
+    response = client.get(
+        f"/medicos/{slot.doctor_id}/calendario",
+        params={"ano": slot.start_time.year, "mes": slot.start_time.month}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["doctor_id"] == slot.doctor_id
+    assert data["days"] == [{"day": slot.start_time.date().isoformat(), "available_slots": 1}]
+
+def test_get_doctor_calendar_not_found(client):
+    response = client.get("/medicos/999/calendario")
+    
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Médico não encontrado."
+
+def test_doctor_calendar_updates_on_book_and_cancel(client, db_session: Session):
+    paciente = db_session.query(Patient).first()
+    slot = db_session.query(Slot).filter(Slot.is_booked == False, Slot.start_time > datetime.utcnow()).first()
+    params = {"ano": slot.start_time.year, "mes": slot.start_time.month}
+    
+    assert len(client.get(f"/medicos/{slot.doctor_id}/calendario", params=params).json()["days"]) == 1
+    
+    response_agenda = client.post(
+        "/agendar/",
+        json={"slot_id": slot.id, "patient_id": paciente.id}
+    )
+    assert response_agenda.status_code == 201
+    assert client.get(f"/medicos/{slot.doctor_id}/calendario", params=params).json()["days"] == []
+    
+    response_cancela = client.post(f"/cancelar/{response_agenda.json()['id']}")
+    assert response_cancela.status_code == 200
+    assert len(client.get(f"/medicos/{slot.doctor_id}/calendario", params=params).json()["days"]) == 1
+
+def test_get_monthly_occupancy(client, db_session: Session):
+    slots = db_session.query(Slot).filter(Slot.start_time > datetime.utcnow()).all()
+    ano, mes = slots[0].start_time.year, slots[0].start_time.month
+    
+    response = client.get("/ocupacao", params={"ano": ano, "mes": mes})
+    
+    assert response.status_code == 200
+    days = {day["day"]: day for day in response.json()["days"]}
+    for slot in slots:
+        if (slot.start_time.year, slot.start_time.month) != (ano, mes):
+            continue
+        expected = [s for s in slots if s.start_time.date() == slot.start_time.date()]
+        day = days[slot.start_time.date().isoformat()]
+        assert day["total_slots"] == len(expected)
+        assert day["booked_slots"] == len([s for s in expected if s.is_booked])
+
+def test_doctor_calendar_counts_slots_in_same_window(client, db_session: Session):
+    doctor = db_session.query(Doctor).first()
+    paciente = db_session.query(Patient).first()
+    inicio = (datetime.utcnow() + timedelta(days=3)).replace(hour=10, minute=0, second=0, microsecond=0)
+    slot_10h = Slot(doctor_id=doctor.id, start_time=inicio, end_time=inicio + timedelta(hours=1), is_booked=False)
+    slot_10h10 = Slot(doctor_id=doctor.id, start_time=inicio + timedelta(minutes=10), end_time=inicio + timedelta(hours=1, minutes=10), is_booked=False)
+    db_session.add_all([slot_10h, slot_10h10])
+    db_session.commit()
+    params = {"ano": inicio.year, "mes": inicio.month}
+    
+    days = {day["day"]: day for day in client.get(f"/medicos/{doctor.id}/calendario", params=params).json()["days"]}
+    assert days[inicio.date().isoformat()]["available_slots"] == 2
+    
+    response_agenda = client.post(
+        "/agendar/",
+        json={"slot_id": slot_10h10.id, "patient_id": paciente.id}
+    )
+    assert response_agenda.status_code == 201
+    
+    days = {day["day"]: day for day in client.get(f"/medicos/{doctor.id}/calendario", params=params).json()["days"]}
+    assert days[inicio.date().isoformat()]["available_slots"] == 1
+    
+    ocupacao = {day["day"]: day for day in client.get("/ocupacao", params=params).json()["days"]}
+    assert ocupacao[inicio.date().isoformat()]["total_slots"] == 2
+    assert ocupacao[inicio.date().isoformat()]["booked_slots"] == 1
+
+def test_doctor_calendar_sees_slots_created_after_first_request(client, db_session: Session):
+    doctor = db_session.query(Doctor).first()
+    inicio = (datetime.utcnow() + timedelta(days=5)).replace(hour=9, minute=0, second=0, microsecond=0)
+    params = {"ano": inicio.year, "mes": inicio.month}
+    client.get(f"/medicos/{doctor.id}/calendario", params=params)
+    
+    db_session.add(Slot(doctor_id=doctor.id, start_time=inicio, end_time=inicio + timedelta(hours=1), is_booked=False))
+    bump_slots_version(db_session)
+    db_session.commit()
+    
+    days = {day["day"]: day for day in client.get(f"/medicos/{doctor.id}/calendario", params=params).json()["days"]}
+    assert days[inicio.date().isoformat()]["available_slots"] == 1